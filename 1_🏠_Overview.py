@@ -2,7 +2,15 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils import load_data, create_sidebar_filters, add_continent_column
+from utils import (
+    load_data,
+    create_sidebar_filters,
+    get_filtered_data,
+    freeze_filters,
+    top_n,
+    DATA_VERSION,
+    MEDAL_TYPE_COLORS,
+)
 
 # Page configuration
 st.set_page_config(
@@ -59,62 +67,24 @@ st.markdown('<div class="sub-header">Dive into the ultimate Paris 2024 Olympics
 
 st.markdown("---")
 
-# Filter data based on selections
-medals_df = data['medals'].copy()
-athletes_df = data['athletes'].copy()
-events_df = data['events'].copy()
-medals_total_df = data['medals_total'].copy()
+# Filter data based on selections (cached per unique filter combination)
+filtered = get_filtered_data(freeze_filters(filters), DATA_VERSION)
+medals_df = filtered['medals']
+athletes_df = filtered['athletes']
+events_df = filtered['events']
+medals_total_df = filtered['medals_total']
+n_medals = filtered['n_medals']
 
 # Identify the medal column name (could be 'medal_type' or 'medal')
 medal_col = 'medal_type' if 'medal_type' in medals_df.columns else 'medal'
 
-# Add continent column for filtering
-medals_total_df = add_continent_column(medals_total_df, 'country_code')
-
-# Apply filters
-if filters['countries']:
-    if 'country_code' in medals_df.columns:
-        medals_df = medals_df[medals_df['country_code'].isin(filters['countries'])]
-    if 'country_code' in athletes_df.columns:
-        athletes_df = athletes_df[athletes_df['country_code'].isin(filters['countries'])]
-    if 'country_code' in medals_total_df.columns:
-        medals_total_df = medals_total_df[medals_total_df['country_code'].isin(filters['countries'])]
-
-if filters['sports']:
-    if 'sport' in events_df.columns:
-        events_df = events_df[events_df['sport'].isin(filters['sports'])]
-    # Try different column names for sport/discipline
-    sport_col = 'discipline' if 'discipline' in medals_df.columns else 'sport'
-    if sport_col in medals_df.columns:
-        medals_df = medals_df[medals_df[sport_col].isin(filters['sports'])]
-        
-# --- Gender filter ---
-# Map M/F to Male/Female in medals_df
-gender_map = {'M': 'Male', 'W': 'Female'}
-if 'gender' in medals_df.columns:
-    medals_df['gender'] = medals_df['gender'].map(gender_map)
-
-# Filter both athletes_df and medals_df
-if filters['genders']:
-    if 'gender' in athletes_df.columns:
-        athletes_df = athletes_df[athletes_df['gender'].isin(filters['genders'])]
-    if 'gender' in medals_df.columns:
-        medals_df = medals_df[medals_df['gender'].isin(filters['genders'])]
-if filters['continents']:
-    if 'continent' in medals_total_df.columns:
-        medals_total_df = medals_total_df[medals_total_df['continent'].isin(filters['continents'])]
-
-if filters['medals']:
-    if medal_col in medals_df.columns:
-        medals_df = medals_df[medals_df[medal_col].isin(filters['medals'])]
-
 # ============= KPI METRICS SECTION =============
 st.header("📊 Key Performance Indicators")
 
 col1, col2, col3, col4, col5 = st.columns(5)
 
 with col1:
-    total_athletes = athletes_df['name'].nunique()
+    total_athletes = filtered['n_athletes']
     st.metric(
         label="👥 Total Athletes",
         value=f"{total_athletes:,}",
@@ -122,10 +92,7 @@ with col1:
     )
 
 with col2:
-    if 'country_code' in athletes_df.columns:
-        total_countries = athletes_df['country_code'].nunique()
-    else:
-        total_countries = 0
+    total_countries = filtered['n_countries']
     st.metric(
         label="🌍 Total Countries",
         value=f"{total_countries}",
@@ -133,7 +100,7 @@ with col2:
     )
 
 with col3:
-    total_sports = events_df['sport'].nunique()
+    total_sports = filtered['n_sports']
     st.metric(
         label="🏃 Total Sports",
         value=f"{total_sports}",
@@ -141,7 +108,7 @@ with col3:
     )
 
 with col4:
-    total_medals = len(medals_df)
+    total_medals = n_medals
     st.metric(
         label="🥇 Total Medals",
         value=f"{total_medals:,}",
@@ -149,7 +116,7 @@ with col4:
     )
 
 with col5:
-    total_events = events_df['event'].nunique()
+    total_events = filtered['n_events']
     st.metric(
         label="🎯 Total Events",
         value=f"{total_events:,}",
@@ -165,23 +132,14 @@ col_left, col_right = st.columns(2)
 with col_left:
     st.subheader("🥇 Global Medal Distribution")
     
-    if len(medals_df) > 0:
+    if n_medals:
         # Count medals by type
-        medal_counts = medals_df[medal_col].value_counts().reset_index()
+        medal_counts = medals_df[medal_col].value_counts()
+        medal_counts = medal_counts[medal_counts > 0].reset_index()
         medal_counts.columns = ['Medal Type', 'Count']
         
         # Create color map based on actual medal names
-        color_map = {}
-        for medal in medal_counts['Medal Type']:
-            medal_lower = str(medal).lower()
-            if 'gold' in medal_lower:
-                color_map[medal] = '#FFD700'
-            elif 'silver' in medal_lower:
-                color_map[medal] = '#C0C0C0'
-            elif 'bronze' in medal_lower:
-                color_map[medal] = '#CD7F32'
-            else:
-                color_map[medal] = '#888888'
+        color_map = {medal: MEDAL_TYPE_COLORS.get(medal, '#888888') for medal in medal_counts['Medal Type']}
         
         # Create donut chart
         fig_donut = px.pie(
@@ -216,12 +174,12 @@ with col_right:
     if len(medals_total_df) > 0:
         # Get top 10 countries by total medal count
         if 'Total' in medals_total_df.columns:
-            top_countries = medals_total_df.nlargest(10, 'Total')
+            top_countries = top_n(medals_total_df, 'Total', 10)
             country_col_display = 'country' if 'country' in top_countries.columns else 'country_code'
         else:
             # Calculate total if column doesn't exist
             medals_total_df['Total'] = medals_total_df.get('Gold', 0) + medals_total_df.get('Silver', 0) + medals_total_df.get('Bronze', 0)
-            top_countries = medals_total_df.nlargest(10, 'Total')
+            top_countries = top_n(medals_total_df, 'Total', 10)
             country_col_display = 'country' if 'country' in top_countries.columns else 'country_code'
         
         if len(top_countries) > 0:
@@ -284,7 +242,7 @@ with insight_col1:
 
 with insight_col2:
     if 'Gold' in medals_total_df.columns and len(medals_total_df) > 0:
-        gold_leader = medals_total_df.nlargest(1, 'Gold')
+        gold_leader = top_n(medals_total_df, 'Gold', 1)
         if len(gold_leader) > 0:
             country_name = gold_leader.iloc[0].get('country', gold_leader.iloc[0].get('country_code', 'N/A'))
             gold_count = gold_leader.iloc[0]['Gold']
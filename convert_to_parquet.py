@@ -0,0 +1,28 @@
+"""
+Convert the dataset CSVs in data/ to Parquet.
+
+Run once after downloading the data:
+
+    python convert_to_parquet.py
+
+load_data() then reads the Parquet copies, which load faster than CSV.
+The filter/group columns are stored as categoricals (dictionary-encoded),
+so they come back with the dtype load_data() would otherwise cast to.
+Re-run it whenever the CSV files change (out-of-date copies are ignored).
+"""
+import os
+import pandas as pd
+from utils import DATA_DIR, DATA_FILES, CATEGORICAL_COLUMNS
+
+def main():
+    for file_name in DATA_FILES.values():
+        csv_path = os.path.join(DATA_DIR, f'{file_name}.csv')
+        parquet_path = os.path.join(DATA_DIR, f'{file_name}.parquet')
+        
+        df = pd.read_csv(csv_path)
+        df = df.astype({col: 'category' for col in CATEGORICAL_COLUMNS if col in df.columns})
+        df.to_parquet(parquet_path, engine='pyarrow', index=False)
+        print(f"✓ {csv_path} -> {parquet_path}")
+
+if __name__ == '__main__':
+    main()
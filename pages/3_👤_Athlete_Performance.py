@@ -1,8 +1,19 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from utils import load_data, create_sidebar_filters, add_continent_column
+from utils import (
+    load_data,
+    create_sidebar_filters,
+    load_frame_with_continent,
+    load_athlete_disciplines,
+    freeze_filters,
+    top_n,
+    box_stats,
+    GENDER_MAP,
+    load_noc_flags,
+)
 
 # Page configuration
 st.set_page_config(
@@ -15,54 +26,118 @@ st.title("👤 Athlete Performance: The Human Story")
 st.markdown("Dive deep into athlete demographics, achievements, and personal profiles")
 st.markdown("---")
 
+@st.cache_data(show_spinner=False, ttl=None)
+def get_filtered(countries, sports, genders, continents, medals):
+    """
+    Apply the sidebar filters and return the filtered frames for this page.
+    
+    Why? load_data() frames are shared across reruns and sessions, so instead
+    of copying them on every rerun the page works on the slices returned here.
+    Caching on the filter tuples means the filtering only runs again when the
+    selection changes. This page doesn't filter on medal type.
+    """
+    # Continent info is added once, on the full frames (cached in utils)
+    athletes_df = load_frame_with_continent('athletes', 'country_code')
+    medals_df = load_frame_with_continent('medals', 'country_code')
+    
+    # Map W/M → Female/Male for display (create separate column)
+    athletes_df['gender_display'] = athletes_df['gender'].map(GENDER_MAP).fillna(athletes_df['gender'])
+    medals_df['gender_display'] = medals_df['gender'].map(GENDER_MAP).fillna(medals_df['gender'])
+    
+    # --- Country filter ---
+    if countries:
+        athletes_df = athletes_df[athletes_df['country_code'].isin(countries)]
+        medals_df = medals_df[medals_df['country_code'].isin(countries)]
+    
+    # --- Sport filter ---
+    sport_col = 'discipline'  # correct column name
+    if sports:
+        # Exact matches on the parsed discipline lists ('Tennis' no longer matches 'Table Tennis')
+        disciplines = load_athlete_disciplines()
+        athlete_ids = disciplines.index[disciplines.isin(sports)]
+        athletes_df = athletes_df[athletes_df.index.isin(athlete_ids)]
+        medals_df = medals_df[medals_df[sport_col].isin(sports)]
+    
+    # Apply gender filter (filter returns 'Male'/'Female', filter on gender_display)
+    if genders:
+        athletes_df = athletes_df[athletes_df['gender_display'].isin(genders)]
+        medals_df = medals_df[medals_df['gender_display'].isin(genders)]
+    
+    # --- Continent filter ---
+    if continents:
+        athletes_df = athletes_df[athletes_df['continent'].isin(continents)]
+        medals_df = medals_df[medals_df['continent'].isin(continents)]
+    
+    return {
+        'athletes': athletes_df,
+        'medals': medals_df
+    }
+
+@st.cache_data(show_spinner=False, ttl=None)
+def get_top_athletes(countries, sports, genders, continents, medals):
+    """
+    Count medals per athlete for the current filters and keep the top 10.
+    
+    Why? The ranking only depends on the filters, so other widgets on the page
+    (athlete search, chart options) reuse it instead of regrouping the medals.
+    """
+    medals_df = get_filtered(countries, sports, genders, continents, medals)['medals']
+    
+    # Count medals per athlete, including gender, sport, and continent
+    athlete_medal_counts = medals_df.groupby('name', observed=True).agg({
+        'medal_type': 'count',
+        'country': 'first',
+        'country_code': 'first',
+        'gender_display': 'first',
+        'discipline': 'first',  # this is the sport
+        'continent': 'first'
+    }).reset_index()
+    
+    # Rename columns for clarity
+    athlete_medal_counts.columns = [
+        'Athlete', 'Total Medals', 'Country', 'Country Code', 'Gender', 'Sport', 'Continent'
+    ]
+    
+    return top_n(athlete_medal_counts, 'Total Medals', 10)
+
+@st.cache_data(show_spinner=False, ttl=None)
+def get_athlete_names(countries, sports, genders, continents, medals):
+    """
+    Sorted athlete names for the search box, once per filter selection.
+    
+    Why? The list is rebuilt on every rerun otherwise, even when only the
+    selected athlete changed. Names are Arrow strings (see load_data), so
+    the dedupe and sort run in Arrow rather than through Python's sorted().
+    """
+    athletes_df = get_filtered(countries, sports, genders, continents, medals)['athletes']
+    return athletes_df['name'].dropna().drop_duplicates().sort_values().tolist()
+
+@st.cache_data(show_spinner=False, ttl=None)
+def get_athlete_rows(countries, sports, genders, continents, medals):
+    """
+    Map each athlete name to its (first) row position in the filtered athletes.
+    
+    Why? The profile card then picks the selected athlete with iloc instead
+    of comparing every name on every selection.
+    """
+    names = get_filtered(countries, sports, genders, continents, medals)['athletes']['name']
+    first = (names.notna() & ~names.duplicated()).to_numpy()
+    return dict(zip(names[first], np.flatnonzero(first)))
+
 # Load data
 data = load_data()
 filters = create_sidebar_filters(data)
 
-athletes_df = data['athletes'].copy()
-medals_df = data['medals'].copy()
-medalists_df = data['medalists'].copy()
-coaches_df = data['coaches'].copy()
-
-# Add continent info
-athletes_df = add_continent_column(athletes_df, 'country_code')
-
-# Map W/M → Female/Male for display (create separate column)
-gender_map = {'M': 'Male', 'W': 'Female'}
-athletes_df['gender_display'] = athletes_df['gender'].map(gender_map).fillna(athletes_df['gender'])
-medals_df['gender_display'] = medals_df['gender'].map(gender_map).fillna(medals_df['gender'])
-
-# --- Country filter ---
-if filters.get('countries'):
-    athletes_df = athletes_df[athletes_df['country_code'].isin(filters['countries'])]
-    medals_df = medals_df[medals_df['country_code'].isin(filters['countries'])]
-
-# --- Sport filter ---
-sport_col = 'discipline'  # correct column name
-if filters.get('sports'):
-    athletes_df = athletes_df[athletes_df['disciplines'].str.contains('|'.join(filters['sports']), na=False)]
-    medals_df = medals_df[medals_df[sport_col].str.contains('|'.join(filters['sports']), na=False)]
-
-# Apply gender filter (filter returns 'Male'/'Female', filter on gender_display)
-if filters.get('genders'):
-    athletes_df = athletes_df[athletes_df['gender_display'].isin(filters['genders'])]
-    medals_df = medals_df[medals_df['gender_display'].isin(filters['genders'])]
-
-# --- Continent filter ---
-if filters.get('continents'):
-    if 'continent' not in athletes_df.columns:
-        athletes_df = add_continent_column(athletes_df, 'country_code')
-    if 'continent' not in medals_df.columns:
-        medals_df = add_continent_column(medals_df, 'country_code')
-    
-    athletes_df = athletes_df[athletes_df['continent'].isin(filters['continents'])]
-    medals_df = medals_df[medals_df['continent'].isin(filters['continents'])]
+# Filtered datasets (cached per unique filter combination)
+filtered = get_filtered(**freeze_filters(filters))
+athletes_df = filtered['athletes']
+medals_df = filtered['medals']
     
 # ============= ATHLETE PROFILE CARD =============
 st.header("🔍 Detailed Athlete Profile")
 
 # Create searchable athlete selector
-athlete_names = sorted(athletes_df['name'].dropna().unique())
+athlete_names = get_athlete_names(**freeze_filters(filters))
 selected_athlete = st.selectbox(
     "Search and select an athlete",
     options=[""] + athlete_names,
@@ -71,7 +146,7 @@ selected_athlete = st.selectbox(
 
 if selected_athlete:
     # Get athlete details
-    athlete_info = athletes_df[athletes_df['name'] == selected_athlete].iloc[0]
+    athlete_info = athletes_df.iloc[get_athlete_rows(**freeze_filters(filters))[selected_athlete]]
     
     # Create profile card layout
     profile_col1, profile_col2 = st.columns([1, 3])
@@ -101,8 +176,8 @@ if selected_athlete:
         st.markdown(f"### {athlete_info['name']}")
         
         # Get country flag emoji
-        country_flag = athlete_info.get('country', '')
-        st.markdown(f"**Country:** {country_flag} {athlete_info['country_code']}")
+        country_flag = load_noc_flags().get(athlete_info['country_code'], '')
+        st.markdown(f"**Country:** {country_flag} {athlete_info.get('country', '')} {athlete_info['country_code']}")
         
         # Physical stats
         col_a, col_b, col_c = st.columns(3)
@@ -138,6 +213,7 @@ if selected_athlete:
             st.success(f"🏅 **Medals Won:** {medal_count}")
             
             medal_types = athlete_medals['medal_type'].value_counts()
+            medal_types = medal_types[medal_types > 0]
             medal_str = ", ".join([f"{count} {medal}" for medal, count in medal_types.items()])
             st.write(medal_str)
         else:
@@ -148,9 +224,8 @@ st.markdown("---")
 # ============= AGE DISTRIBUTION (BOX PLOT) =============
 st.header("📊 Age Distribution Analysis")
 
-# Calculate age (birth_date is in the dataset)
+# Calculate age (birth_date is in the dataset, parsed in load_data)
 if 'birth_date' in athletes_df.columns:
-    athletes_df['birth_date'] = pd.to_datetime(athletes_df['birth_date'], errors='coerce')
     athletes_df['age'] = 2024 - athletes_df['birth_date'].dt.year
     
     # Remove invalid ages (negative or unrealistic)
@@ -161,37 +236,49 @@ if 'age' in athletes_df.columns and not athletes_df['age'].isna().all():
     viz_choice = st.radio("View age distribution by:", ["Sport", "Gender"], horizontal=True)
 
     if viz_choice == "Sport":
-        # Parse disciplines column safely (it's a string representation of a list)
-        def parse_discipline(disc_str):
-            """Safely parse discipline string to extract first sport"""
-            if pd.isna(disc_str):
-                return None
-            if isinstance(disc_str, str):
-                # Remove brackets and quotes, split by comma, take first
-                clean = disc_str.strip("[]'\"")
-                if ',' in clean:
-                    return clean.split(',')[0].strip("'\" ")
-                return clean.strip("'\" ")
-            return str(disc_str)
-        
-        athletes_df['disciplines_parsed'] = athletes_df['disciplines'].apply(parse_discipline)
+        # First sport of the disciplines column (a string representation of a list):
+        # remove brackets and quotes, split by comma, take first
+        disciplines_parsed = (
+            athletes_df['disciplines'].str.strip("[]'\"").str.split(',').str[0].str.strip("'\" ")
+        )
         
         # Get top 10 sports by participant count
-        top_sports = athletes_df['disciplines_parsed'].value_counts().head(10).index.tolist()
-        athletes_sport = athletes_df[athletes_df['disciplines_parsed'].isin(top_sports)].copy()
+        top_sports = disciplines_parsed.value_counts().head(10).index.tolist()
+        in_top_sports = disciplines_parsed.isin(top_sports)
+        
+        # Only the two columns the chart needs, not a copy of every athlete column
+        athletes_sport = pd.DataFrame({
+            'disciplines_parsed': disciplines_parsed[in_top_sports],
+            'age': athletes_df.loc[in_top_sports, 'age']
+        })
         
         if len(athletes_sport) > 0:
-            fig_age = px.box(
-                athletes_sport,
-                x='disciplines_parsed',
-                y='age',
-                color='disciplines_parsed',
-                title='Age Distribution by Sport (Top 10 Sports)',
-                labels={'disciplines_parsed': 'Sport', 'age': 'Age (years)'},
-                points='outliers'
-            )
+            # Boxes from precomputed quartiles: the chart gets ~6 numbers per
+            # sport plus the outliers, not every athlete's age
+            age_stats, age_outliers = box_stats(athletes_sport, 'disciplines_parsed', 'age')
+            
+            fig_age = go.Figure([
+                go.Box(
+                    x=age_stats['disciplines_parsed'],
+                    q1=age_stats['q1'],
+                    median=age_stats['median'],
+                    q3=age_stats['q3'],
+                    lowerfence=age_stats['lowerfence'],
+                    upperfence=age_stats['upperfence'],
+                    name='Age',
+                    boxpoints=False
+                ),
+                go.Scattergl(
+                    x=age_outliers['disciplines_parsed'],
+                    y=age_outliers['age'],
+                    mode='markers',
+                    name='Outliers',
+                    marker=dict(size=5, color='#1f77b4')
+                )
+            ])
             
             fig_age.update_layout(
+                title='Age Distribution by Sport (Top 10 Sports)',
                 xaxis_tickangle=-45,
                 showlegend=False,
                 height=500,
@@ -264,7 +351,7 @@ st.header("⚖️ Gender Distribution Analysis")
 geo_level = st.radio("Analyze gender distribution by:", ["World", "Continent", "Country"], horizontal=True)
 
 # Ensure we have valid gender data
-athletes_with_gender = athletes_df[athletes_df['gender_display'].notna()].copy()
+athletes_with_gender = athletes_df[athletes_df['gender_display'].notna()]
 
 if len(athletes_with_gender) == 0:
     st.warning("No gender data available")
@@ -324,27 +411,8 @@ st.markdown("---")
 # ============= TOP ATHLETES BY MEDALS =============
 st.header("🏆 Top 10 Athletes by Medal Count")
 
-# Make sure the continent column exists (do this BEFORE filtering affected the data)
-if 'continent' not in medals_df.columns:
-    medals_df = add_continent_column(medals_df, country_col='country_code')
-
-# Count medals per athlete, including gender, sport, and continent
-athlete_medal_counts = medals_df.groupby('name').agg({
-    'medal_type': 'count',
-    'country': 'first',
-    'country_code': 'first',
-    'gender_display': 'first',
-    'discipline': 'first',  # this is the sport
-    'continent': 'first'
-}).reset_index()
-
-# Rename columns for clarity
-athlete_medal_counts.columns = [
-    'Athlete', 'Total Medals', 'Country', 'Country Code', 'Gender', 'Sport', 'Continent'
-]
-
-# Sort top 10
-athlete_medal_counts = athlete_medal_counts.sort_values('Total Medals', ascending=False).head(10)
+# Top 10 athletes by medal count (cached per filter selection)
+athlete_medal_counts = get_top_athletes(**freeze_filters(filters))
 
 if len(athlete_medal_counts) > 0:
     # Create bar chart
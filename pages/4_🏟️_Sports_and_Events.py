@@ -1,8 +1,20 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from utils import load_data, create_sidebar_filters
+import pydeck as pdk
+from utils import (
+    load_data,
+    create_sidebar_filters,
+    load_frame_with_continent,
+    freeze_filters,
+    filter_frames,
+    sample_evenly,
+    top_n,
+    uncategorize,
+    GENDER_MAP,
+)
 import os
 from geopy.geocoders import Nominatim
 
@@ -17,87 +29,121 @@ st.title("🏟️ Sports & Events: The Competition Arena")
 st.markdown("Explore event schedules, venue locations, and sport-specific medal distributions")
 st.markdown("---")
 
+@st.cache_data(show_spinner=False, ttl=None)
+def get_filtered(countries, sports, genders, continents, medals):
+    """
+    Apply the sidebar filters and return the filtered frames for this page.
+    
+    Why? load_data() frames are shared across reruns and sessions, so instead
+    of copying them on every rerun the page works on the slices returned here.
+    Caching on the filter tuples means the filtering only runs again when the
+    selection changes.
+    """
+    data = load_data()
+    
+    # Continent info is added once, on the full frames (cached in utils), for
+    # the frames that have country codes
+    medals_df = load_frame_with_continent('medals', 'country_code')
+    events_df, schedules_df = (
+        load_frame_with_continent(name) if 'country_code' in data[name].columns else data[name]
+        for name in ('events', 'schedules')
+    )
+    
+    # ====== MAP GENDER FIRST (because medals_df uses W/M) ======
+    # events/schedules can be the shared load_data() frames, so assign() a new column
+    if 'gender' in medals_df.columns:
+        medals_df['gender'] = medals_df['gender'].map(GENDER_MAP)
+    if 'gender' in events_df.columns:
+        events_df = events_df.assign(gender=events_df['gender'].map(GENDER_MAP))
+    if 'gender' in schedules_df.columns:
+        schedules_df = schedules_df.assign(gender=schedules_df['gender'].map(GENDER_MAP))
+    
+    
+    # ================= APPLY FILTERS =================
+    # One combined mask and one slice per frame; empty selections and columns
+    # a frame doesn't have are skipped (events name the sport 'sport', the
+    # others 'discipline')
+    filtered = filter_frames({
+        'events': (events_df, {
+            'sport': sports, 'country_code': countries, 'gender': genders, 'continent': continents
+        }),
+        'schedules': (schedules_df, {
+            'discipline': sports, 'country_code': countries, 'gender': genders, 'continent': continents
+        }),
+        'medals': (medals_df, {
+            'discipline': sports, 'country_code': countries, 'gender': genders,
+            'continent': continents, 'medal_type': medals
+        })
+    })
+    events_df, schedules_df, medals_df = filtered['events'], filtered['schedules'], filtered['medals']
+    
+    # Calendar day of each event (Paris time) for the day selector, and the
+    # Games period it covers
+    if 'start_date' in schedules_df.columns:
+        schedules_df = schedules_df.assign(
+            start_day=schedules_df['start_date'].dt.tz_localize(None).dt.normalize()
+        )
+    days = pd.concat([schedules_df.get('start_day'), medals_df['medal_date']]).dropna()
+    
+    return {
+        'events': events_df,
+        'schedules': schedules_df,
+        'medals': medals_df,
+        'date_range': (days.min().date(), days.max().date()) if len(days) else None
+    }
+
+@st.cache_data(show_spinner=False, ttl=None)
+def get_medal_counts(countries, sports, genders, continents, medals):
+    """
+    Count the filtered medals per sport, per type and country, and per day.
+    
+    Why? The sport charts, the head-to-head and "who won the day" sections
+    only show or slice these counts, so they're computed once per filter
+    selection instead of on every selectbox change or slider tick.
+    """
+    medals_df = get_filtered(countries, sports, genders, continents, medals)['medals']
+    by_sport = medals_df.groupby('discipline', observed=True).size().reset_index(name='medal_count')
+    return {
+        'by_sport': by_sport,
+        'by_sport_type': medals_df.groupby(['discipline', 'medal_type'], observed=True).size().reset_index(name='medal_count'),
+        'top_sports': top_n(by_sport, 'medal_count', 15),
+        'by_country': medals_df.groupby(['medal_type', 'country_code'], observed=True).size(),
+        'by_day': medals_df.groupby(['medal_date', 'country_code', 'medal_type'], observed=True).size()
+    }
+
+@st.cache_data(persist="disk", show_spinner=False)
+def geocode_venue(venue_name):
+    """
+    Geocode a venue name to (latitude, longitude), or None if it isn't found.
+    
+    Why? persist="disk" keeps each answer across reruns and restarts, so a
+    venue is only ever sent to Nominatim once. Network errors are raised
+    rather than cached, so a failed lookup is retried on the next run.
+    """
+    geolocator = Nominatim(user_agent="paris_olympic_dashboard")
+    # Try with Paris, France first
+    location = geolocator.geocode(f"{venue_name}, Paris, France", timeout=10)
+    if location:
+        return location.latitude, location.longitude
+    return None
+
+@st.cache_data(show_spinner=False)
+def load_venue_coordinates(coord_path):
+    """Read the saved venue coordinates once, as {venue: (latitude, longitude)}."""
+    coords_df = pd.read_csv(coord_path)
+    return dict(zip(coords_df['venue'], zip(coords_df['latitude_x'], coords_df['longitude_x'])))
+
 # Load data
 data = load_data()
 filters = create_sidebar_filters(data)
 
-events_df = data['events'].copy()
-schedules_df = data['schedules'].copy()
-venues_df = data['venues'].copy()
-medals_df = data['medals'].copy()
-
-# ====== MAP GENDER FIRST (because medals_df uses W/M) ======
-gender_map = {'M': 'Male', 'W': 'Female'}
-if 'gender' in medals_df.columns:
-    medals_df['gender'] = medals_df['gender'].map(gender_map)
-if 'gender' in events_df.columns:
-    events_df['gender'] = events_df['gender'].map(gender_map)
-if 'gender' in schedules_df.columns:
-    schedules_df['gender'] = schedules_df['gender'].map(gender_map)
-
-
-# ================= APPLY FILTERS =================
-
-# --- Sport filter ---
-if filters.get('sports'):
-    events_df = events_df[events_df['sport'].isin(filters['sports'])]
-
-    if 'discipline' in schedules_df.columns:
-        schedules_df = schedules_df[schedules_df['discipline'].isin(filters['sports'])]
-
-    if 'discipline' in medals_df.columns:
-        medals_df = medals_df[medals_df['discipline'].isin(filters['sports'])]
-
-
-# --- Country filter ---
-if filters.get('countries'):
-    events_df = events_df[events_df['country_code'].isin(filters['countries'])] \
-        if 'country_code' in events_df.columns else events_df
-
-    schedules_df = schedules_df[schedules_df['country_code'].isin(filters['countries'])] \
-        if 'country_code' in schedules_df.columns else schedules_df
-
-    medals_df = medals_df[medals_df['country_code'].isin(filters['countries'])]
-
-
-# --- Gender filter (NOW IT FINALLY WORKS) ---
-if filters.get('genders'):
-    events_df = events_df[events_df['gender'].isin(filters['genders'])] \
-        if 'gender' in events_df.columns else events_df
-
-    schedules_df = schedules_df[schedules_df['gender'].isin(filters['genders'])] \
-        if 'gender' in schedules_df.columns else schedules_df
-
-    medals_df = medals_df[medals_df['gender'].isin(filters['genders'])]
-
-
-# --- Continent filter ---
-from utils import add_continent_column   # if it's in another file
-
-if 'country_code' in medals_df.columns:
-    medals_df = add_continent_column(medals_df)
-
-if 'country_code' in events_df.columns:
-    events_df = add_continent_column(events_df)
-
-if 'country_code' in schedules_df.columns:
-    schedules_df = add_continent_column(schedules_df)
-    
-if filters.get('continents'):
-    medals_df = medals_df[medals_df['continent'].isin(filters['continents'])] \
-        if 'continent' in medals_df.columns else medals_df
-
-    events_df = events_df[events_df['continent'].isin(filters['continents'])] \
-        if 'continent' in events_df.columns else events_df
-
-    schedules_df = schedules_df[schedules_df['continent'].isin(filters['continents'])] \
-        if 'continent' in schedules_df.columns else schedules_df
-
-
-# --- Medal type filter ---
-if filters.get('medals'):
-    medals_df = medals_df[medals_df['medal_type'].isin(filters['medals'])] \
-        if 'medal_type' in medals_df.columns else medals_df
+# Filtered datasets (cached per unique filter combination)
+filtered = get_filtered(**freeze_filters(filters))
+events_df = filtered['events']
+schedules_df = filtered['schedules']
+medals_df = filtered['medals']
+medal_counts = get_medal_counts(**freeze_filters(filters))
+venues_df = data['venues']
 
 # ============= TASK 1: EVENT SCHEDULE (GANTT CHART) =============
 st.header("📅 Event Schedule Timeline")
@@ -110,7 +156,7 @@ if schedule_view == "Sport":
     available_sports = sorted(schedules_df['discipline'].dropna().unique())
     if len(available_sports) > 0:
         selected_sport = st.selectbox("Select a Sport", available_sports)
-        filtered_schedule = schedules_df[schedules_df['discipline'] == selected_sport].copy()
+        filtered_schedule = schedules_df[schedules_df['discipline'] == selected_sport]
         title_suffix = f"for {selected_sport}"
     else:
         st.warning("No sports available with current filters")
@@ -119,7 +165,7 @@ else:
     available_venues = sorted(schedules_df['venue'].dropna().unique())
     if len(available_venues) > 0:
         selected_venue = st.selectbox("Select a Venue", available_venues)
-        filtered_schedule = schedules_df[schedules_df['venue'] == selected_venue].copy()
+        filtered_schedule = schedules_df[schedules_df['venue'] == selected_venue]
         title_suffix = f"at {selected_venue}"
     else:
         st.warning("No venues available")
@@ -127,17 +173,13 @@ else:
 
 # Prepare data for Gantt chart
 if not filtered_schedule.empty:
-    # Convert date columns to datetime
-    filtered_schedule['start_date'] = pd.to_datetime(filtered_schedule['start_date'])
-    filtered_schedule['end_date'] = pd.to_datetime(filtered_schedule['end_date'])
-    
-    # Limit to reasonable number for readability
+    # Limit to reasonable number for readability, spread over the whole schedule
     display_limit = st.slider("Number of events to display", 10, 100, 50, 10)
-    filtered_schedule_display = filtered_schedule.head(display_limit)
+    filtered_schedule_display = sample_evenly(filtered_schedule, display_limit, 'start_date')
     
     # Create Gantt chart using plotly.express.timeline
     fig_gantt = px.timeline(
-        filtered_schedule_display,
+        uncategorize(filtered_schedule_display),
         x_start='start_date',
         x_end='end_date',
         y='event',
@@ -158,7 +200,7 @@ if not filtered_schedule.empty:
     st.plotly_chart(fig_gantt, use_container_width=True)
     
     if len(filtered_schedule) > display_limit:
-        st.info(f"ℹ️ Showing {display_limit} of {len(filtered_schedule)} events. Adjust the slider to see more.")
+        st.info(f"ℹ️ Showing {display_limit} of {len(filtered_schedule)} events, spread across the schedule. Adjust the slider to see more.")
 else:
     st.warning("No events found for the selected filters.")
 
@@ -169,11 +211,9 @@ st.header("🎯 Medal Count by Sport")
 st.markdown("**Treemap showing the medal count by sport**")
 
 if len(medals_df) > 0:
-    # Group medals by sport (discipline)
-    sport_medals = medals_df.groupby('discipline').size().reset_index(name='medal_count')
-    
-    # Also create hierarchical data: Sport -> Medal Type
-    sport_medal_detail = medals_df.groupby(['discipline', 'medal_type']).size().reset_index(name='medal_count')
+    # Medals by sport (discipline) and by Sport -> Medal Type, cached per filter selection
+    sport_medals = medal_counts['by_sport']
+    sport_medal_detail = medal_counts['by_sport_type']
     
     # Create two columns for different treemap views
     col_tree1, col_tree2 = st.columns(2)
@@ -182,7 +222,7 @@ if len(medals_df) > 0:
         st.subheader("Medal Count by Sport")
         # Simple treemap: just sports
         fig_treemap1 = px.treemap(
-            sport_medals,
+            uncategorize(sport_medals),
             path=['discipline'],
             values='medal_count',
             title='Total Medals by Sport',
@@ -204,7 +244,7 @@ if len(medals_df) > 0:
         st.subheader("Medal Count by Sport & Type")
         # Hierarchical treemap: Sport -> Medal Type
         fig_treemap2 = px.treemap(
-            sport_medal_detail,
+            uncategorize(sport_medal_detail),
             path=['discipline', 'medal_type'],
             values='medal_count',
             title='Medals by Sport and Type',
@@ -224,10 +264,10 @@ if len(medals_df) > 0:
     
     # Additional bar chart for comparison
     st.subheader("Top 15 Sports by Medal Count")
-    top_sports = sport_medals.nlargest(15, 'medal_count')
+    top_sports = medal_counts['top_sports']
     
     fig_bar_sports = px.bar(
-        top_sports,
+        uncategorize(top_sports),
         x='medal_count',
         y='discipline',
         orientation='h',
@@ -263,46 +303,47 @@ st.markdown("**Scatter mapbox showing the locations of Olympic venues in the Par
 # Load or generate coordinates
 coord_path = "data/venue_coordinates.csv"
 
-if os.path.exists(coord_path):
-    # Load existing coordinates
-    coords_df = pd.read_csv(coord_path)
+# Load existing coordinates
+venue_coords = load_venue_coordinates(coord_path) if os.path.exists(coord_path) else {}
+
+# Only geocode distinct venues the saved file doesn't cover yet
+missing_venues = [v for v in venues_df['venue'].dropna().unique() if v not in venue_coords]
+
+if not missing_venues:
     st.info("✓ Using cached venue coordinates")
 else:
     # Generate coordinates using geopy
     st.warning("🔄 Geocoding venues... This may take a moment (only runs once)")
     
-    geolocator = Nominatim(user_agent="paris_olympic_dashboard")
-    
-    def get_coords(venue_name):
-        """Geocode venue name to get latitude and longitude"""
+    # One lookup per missing venue, one at a time (Nominatim allows 1 request/s).
+    # Only answers are saved ("not found" as NaN); a lookup that raised (timeout,
+    # network error, rate limit) is left out so the next run tries it again
+    n_resolved = 0
+    for venue_name in missing_venues:
         try:
-            # Try with Paris, France first
-            location = geolocator.geocode(f"{venue_name}, Paris, France", timeout=10)
-            if location:
-                return pd.Series([location.latitude, location.longitude])
-
+            latlon = geocode_venue(venue_name)
         except Exception as e:
             st.warning(f"Could not geocode {venue_name}: {e}")
-        
-        return pd.Series([None, None])
-    
-    # Apply geocoding to all venues
-    venues_df[['latitude_x', 'longitude_x']] = venues_df['venue'].apply(get_coords)
+            continue
+        venue_coords[venue_name] = latlon or (np.nan, np.nan)
+        n_resolved += 1
     
     # Save coordinates to CSV for future use
-    coords_df = venues_df[['venue', 'latitude_x', 'longitude_x']].copy()
-    coords_df.to_csv(coord_path, index=False)
-    st.success(f"✓ Coordinates saved to {coord_path}")
-
-# Merge coordinates with venues dataframe
-venues_with_coords = venues_df.merge(coords_df, on="venue", how="left", suffixes=('', '_coord'))
-
-# Use the coordinate columns (handle both column name scenarios)
-if 'latitude_x' not in venues_with_coords.columns:
-    venues_with_coords = venues_with_coords.rename(columns={
-        'latitude_x_coord': 'latitude_x',
-        'longitude_x_coord': 'longitude_x'
-    })
+    if n_resolved:
+        pd.DataFrame(
+            [(venue, lat, lon) for venue, (lat, lon) in venue_coords.items()],
+            columns=['venue', 'latitude_x', 'longitude_x']
+        ).to_csv(coord_path, index=False)
+        load_venue_coordinates.clear()
+        st.success(f"✓ Coordinates saved to {coord_path}")
+
+# Look the coordinates up by venue name straight into float32 arrays (plenty for
+# map positions); assign() leaves the shared venues frame alone
+latlon = np.array(
+    [venue_coords.get(venue, (np.nan, np.nan)) for venue in venues_df['venue']],
+    dtype='float32'
+).reshape(-1, 2)
+venues_with_coords = venues_df.assign(latitude_x=latlon[:, 0], longitude_x=latlon[:, 1])
 
 # Filter venues with valid coordinates
 venues_mapped = venues_with_coords.dropna(subset=['latitude_x', 'longitude_x'])
@@ -310,12 +351,10 @@ venues_mapped = venues_with_coords.dropna(subset=['latitude_x', 'longitude_x'])
 if len(venues_mapped) > 0:
     st.success(f"📍 Successfully mapped {len(venues_mapped)} out of {len(venues_df)} venues")
     
-    # Parse sports list for better display
-    venues_mapped['sports_display'] = venues_mapped['sports'].apply(
-        lambda x: ', '.join(eval(x)) if isinstance(x, str) and x.startswith('[') else str(x)
-    )
+    # sports_display (the parsed sports list) is built in load_data
     
-    # Create scatter mapbox with plotly
+    # Create scatter mapbox with plotly. One trace for all venues: coloring by the
+    # sports string gave every venue its own trace and legend entry
     fig_map = px.scatter_mapbox(
         venues_mapped,
         lat="latitude_x",
@@ -328,7 +367,7 @@ if len(venues_mapped) > 0:
             "latitude_x": False,
             "longitude_x": False
         },
-        color="sports_display",
+        color_discrete_sequence=['#1f77b4'],
         zoom=10,
         height=600,
         title="Olympic Venues - Interactive Map",
@@ -347,35 +386,50 @@ if len(venues_mapped) > 0:
     
     st.plotly_chart(fig_map, use_container_width=True)
     
-    # Alternative: Streamlit native map
-    st.subheader("📌 Alternative View: Streamlit Native Map")
+    # Alternative: pydeck map (WebGL, so it stays fast however many venues there are)
+    st.subheader("📌 Alternative View: Venue Labels Map")
     
-    df_clean = venues_mapped.dropna(subset=['latitude_x', 'longitude_x']).copy()
+    deck_data = venues_mapped[['venue', 'sports_display', 'latitude_x', 'longitude_x']].astype({
+        'venue': str, 'sports_display': str
+    })
     
-    if len(df_clean) > 0:
-        # Rename columns for st.map compatibility
-        df_clean_map = df_clean.rename(columns={
-            'latitude_x': 'latitude',
-            'longitude_x': 'longitude'
-        })
-        
-        st.map(
-            data=df_clean_map,
-            latitude="latitude",
-            longitude="longitude",
-            zoom=10,
-            use_container_width=True
-        )
+    st.pydeck_chart(pdk.Deck(
+        layers=[
+            pdk.Layer(
+                "ScatterplotLayer",
+                data=deck_data,
+                get_position=['longitude_x', 'latitude_x'],
+                get_fill_color=[31, 119, 180, 200],
+                get_radius=250,
+                pickable=True
+            ),
+            pdk.Layer(
+                "TextLayer",
+                data=deck_data,
+                get_position=['longitude_x', 'latitude_x'],
+                get_text='venue',
+                get_size=12,
+                get_pixel_offset=[0, -14]
+            )
+        ],
+        initial_view_state=pdk.ViewState(
+            latitude=float(deck_data['latitude_x'].mean()),
+            longitude=float(deck_data['longitude_x'].mean()),
+            zoom=10
+        ),
+        tooltip={"text": "{venue}\n{sports_display}"}
+    ), use_container_width=True)
     
     # Display venue information table
     st.subheader("📋 Venue Details with Coordinates")
     
-    display_venues = venues_mapped[['venue', 'sports_display', 'latitude_x', 'longitude_x']].copy()
-    display_venues.columns = ['Venue', 'Sports', 'Latitude', 'Longitude']
-    
-    # Format coordinates to 4 decimal places
-    display_venues['Latitude'] = display_venues['Latitude'].round(4)
-    display_venues['Longitude'] = display_venues['Longitude'].round(4)
+    # Coordinates to 4 decimal places (as float64, so they print as such)
+    display_venues = pd.DataFrame({
+        'Venue': venues_mapped['venue'],
+        'Sports': venues_mapped['sports_display'],
+        'Latitude': venues_mapped['latitude_x'].astype('float64').round(4),
+        'Longitude': venues_mapped['longitude_x'].astype('float64').round(4)
+    })
     
     st.dataframe(display_venues, use_container_width=True, hide_index=True)
     
@@ -419,14 +473,14 @@ with c1:
 with c2:
     country_b = st.selectbox("Country B:", countries)
 
-# Filter only these two countries
-comp_df = medals_df[medals_df['country_code'].isin([country_a, country_b])]
-
-# Count medals by type for each country
-comp_count = comp_df.groupby(['medal_type', 'country_code']).size().reset_index(name='count')
+# Medal counts by type for only these two countries
+by_country = medal_counts['by_country']
+comp_count = by_country[
+    by_country.index.get_level_values('country_code').isin([country_a, country_b])
+].reset_index(name='count')
 
 fig_compare = px.bar(
-    comp_count,
+    uncategorize(comp_count),
     x='medal_type',
     y='count',
     color='country_code',
@@ -439,60 +493,62 @@ st.plotly_chart(fig_compare, use_container_width=True)
 # ================= TASK 5: WHO WON THE DAY =================
 st.header(" Who Won the Day? — Medals & Events Timeline")
 
-# Convert date columns to datetime.date
-medals_df['medal_date'] = pd.to_datetime(medals_df['medal_date']).dt.date
-schedules_df['start_date'] = pd.to_datetime(schedules_df['start_date']).dt.date
-
-# Games period
-min_date = min(schedules_df['start_date'].min(), medals_df['medal_date'].min())
-max_date = max(schedules_df['start_date'].max(), medals_df['medal_date'].max())
-
-# Day selector
-selected_date = st.slider(
-    "Select a Day of the Games:",
-    min_value=min_date,
-    max_value=max_date,
-    value=min_date,
-    format="YYYY-MM-DD"
-)
-
-# --- Medals ---
-medals_today = medals_df[medals_df['medal_date'] == selected_date]
+# Games period (dates are parsed in load_data, the range is computed with the filters)
+date_range = filtered['date_range']
 
-if medals_today.empty:
-    st.info(f"No medals awarded on {selected_date}.")
+if date_range is None:
+    st.info("No medals or events found for the selected filters.")
 else:
-    summary = medals_today.groupby(['country_code', 'medal_type']).size().reset_index(name='count')
-    fig_medals = px.bar(
-        summary,
-        x='country_code',
-        y='count',
-        color='medal_type',
-        text='count',
-        labels={'count': 'Number of Medals', 'country_code': 'Country', 'medal_type': 'Medal Type'},
-        title=f"Medals Awarded on {selected_date}",
-        barmode='stack'
+    min_date, max_date = date_range
+
+    # Day selector
+    selected_date = st.slider(
+        "Select a Day of the Games:",
+        min_value=min_date,
+        max_value=max_date,
+        value=min_date,
+        format="YYYY-MM-DD"
     )
-    fig_medals.update_traces(textposition='outside')
-    fig_medals.update_layout(height=500, margin=dict(t=50, b=50))
-    st.plotly_chart(fig_medals, use_container_width=True)
+    selected_day = pd.Timestamp(selected_date)
 
-# --- Events ---
-events_today = schedules_df[schedules_df['start_date'] == selected_date]
+    # --- Medals ---
+    by_day = medal_counts['by_day']
 
-if events_today.empty:
-    st.info(f"No events scheduled on {selected_date}.")
-else:
-    st.subheader(f"Events on {selected_date}")
-    display_events = events_today[['discipline', 'event', 'venue', 'start_date', 'end_date', 'phase', 'gender']].copy()
-    display_events = display_events.rename(columns={
-        'discipline': 'Sport',
-        'event': 'Event',
-        'venue': 'Venue',
-        'start_date': 'Start Date',
-        'end_date': 'End Date',
-        'phase': 'Phase',
-        'gender': 'Gender'
-    })
-    st.dataframe(display_events, use_container_width=True)
+    if selected_day not in by_day.index.get_level_values('medal_date'):
+        st.info(f"No medals awarded on {selected_date}.")
+    else:
+        summary = by_day.xs(selected_day, level='medal_date').reset_index(name='count')
+        fig_medals = px.bar(
+            uncategorize(summary),
+            x='country_code',
+            y='count',
+            color='medal_type',
+            text='count',
+            labels={'count': 'Number of Medals', 'country_code': 'Country', 'medal_type': 'Medal Type'},
+            title=f"Medals Awarded on {selected_date}",
+            barmode='stack'
+        )
+        fig_medals.update_traces(textposition='outside')
+        fig_medals.update_layout(height=500, margin=dict(t=50, b=50))
+        st.plotly_chart(fig_medals, use_container_width=True)
+
+    # --- Events ---
+    events_today = schedules_df[schedules_df['start_day'] == selected_day]
+
+    if events_today.empty:
+        st.info(f"No events scheduled on {selected_date}.")
+    else:
+        st.subheader(f"Events on {selected_date}")
+        display_events = events_today[['discipline', 'event', 'venue', 'start_date', 'end_date', 'phase', 'gender']].assign(
+            start_date=events_today['start_date'].dt.date
+        ).rename(columns={
+            'discipline': 'Sport',
+            'event': 'Event',
+            'venue': 'Venue',
+            'start_date': 'Start Date',
+            'end_date': 'End Date',
+            'phase': 'Phase',
+            'gender': 'Gender'
+        })
+        st.dataframe(display_events, use_container_width=True)
 st.caption("💡 Use the sidebar filters to explore specific sports and countries. Click on map markers for venue details!")
\ No newline at end of file
@@ -1,25 +1,198 @@
+import os
+import ast
+import pickle
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import streamlit as st
 import pycountry
 import pycountry_convert as pc
+from pycountry_convert.convert_country_alpha2_to_continent_code import COUNTRY_ALPHA2_TO_CONTINENT_CODE
+from pycountry_convert.convert_continent_code_to_continent_name import CONTINENT_CODE_TO_CONTINENT_NAME
 
-@st.cache_data
+DATA_DIR = 'data'
+
+# Dataset name -> file name (without extension) in DATA_DIR
+DATA_FILES = {
+    'athletes': 'athletes',
+    'medals': 'medals',
+    'medals_total': 'medals_total',
+    'events': 'events',
+    'nocs': 'nocs',
+    'schedules': 'schedules',  # Note: schedules.csv not schedule.csv
+    'venues': 'venues',
+    'coaches': 'coaches',
+    'medalists': 'medallists'  # Note: medallists.csv
+}
+
+# Columns the pages use, for the datasets where the files carry much more
+# (athletes.csv is mostly biography text). Datasets not listed are read whole.
+DATA_COLUMNS = {
+    'athletes': ['code', 'name', 'gender', 'country_code', 'country', 'height', 'weight',
+                 'disciplines', 'birth_date', 'coach'],
+    'medals': ['medal_type', 'medal_date', 'name', 'gender', 'discipline', 'event',
+               'country_code', 'country'],
+    'schedules': ['start_date', 'end_date', 'discipline', 'event', 'phase', 'gender', 'venue']
+}
+
+# Low-cardinality text columns that every page filters and groups on
+# ('continent' is added as a categorical by add_continent_column)
+CATEGORICAL_COLUMNS = ['country_code', 'discipline', 'sport', 'gender', 'medal_type', 'venue', 'phase']
+
+# High-cardinality text columns (searched and compared, not grouped): stored as
+# Arrow-backed strings instead of one Python object per row
+STRING_COLUMNS = ['name', 'sports_display']
+
+# Consistent medal colors used by every chart
+MEDAL_COLORS = {'Gold': '#FFD700', 'Silver': '#C0C0C0', 'Bronze': '#CD7F32'}
+
+# Same colors keyed by the medal_type values used in the dataset ('Gold Medal', ...)
+MEDAL_TYPE_COLORS = {f'{medal} Medal': color for medal, color in MEDAL_COLORS.items()}
+
+# Date columns parsed once in load_data (ISO 8601 text in the CSVs)
+DATE_COLUMNS = {
+    'medals': ['medal_date'],
+    'athletes': ['birth_date'],
+    'schedules': ['start_date', 'end_date']
+}
+
+# Medal tables code gender as M/W (plus X/O for mixed and open events, kept
+# as they are); the sidebar filter offers Male/Female
+GENDER_MAP = {'M': 'Male', 'W': 'Female'}
+
+# Part of the shared filter cache key (see get_filtered_data) and stored with
+# the on-disk copy of the prepared data. Bump it when the data files or the
+# preparation in prepare_data() change.
+DATA_VERSION = '3'
+
+# Prepared frames saved across restarts (see read_data_cache)
+DATA_CACHE_PATH = os.path.join(DATA_DIR, '.load_data.pkl')
+
+# Below this many rows in total, the filter stage runs serially (see filter_frames)
+PARALLEL_FILTER_MIN_ROWS = 1_000_000
+
+# Special Olympic codes that aren't standard ISO codes
+SPECIAL_CODES = {
+    'ROC': 'Europe',  # Russian Olympic Committee
+    'AIN': 'Europe',  # Individual Neutral Athletes
+    'EOR': 'Unknown', # Refugee Olympic Team
+    'IOP': 'Unknown'  # Independent Olympic Participants
+}
+
+def read_table(file_name, columns=None):
+    """
+    Read one dataset file, preferring its Parquet copy when there is one.
+    
+    Why? Parquet is columnar and already typed, so it loads faster than
+    parsing CSV text. The copies are made by convert_to_parquet.py; a copy
+    older than its CSV is ignored so edited CSVs are never shadowed.
+    columns limits the read to those columns (any the file lacks are
+    skipped); the filter columns are parsed straight to categoricals.
+    """
+    csv_path = os.path.join(DATA_DIR, f'{file_name}.csv')
+    parquet_path = os.path.join(DATA_DIR, f'{file_name}.parquet')
+    
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+        if columns is not None:
+            available = set(pq.read_schema(parquet_path).names)
+            columns = [col for col in columns if col in available]
+        return pd.read_parquet(parquet_path, engine='pyarrow', columns=columns)
+    return pd.read_csv(
+        csv_path,
+        usecols=None if columns is None else (lambda col: col in columns),
+        dtype={col: 'category' for col in CATEGORICAL_COLUMNS}
+    )
+
+@st.cache_resource
 def load_data():
     """
-    Load all required CSV files with caching for performance.
-    The @st.cache_data decorator ensures data is loaded only once.
-    """
-    data = {
-        'athletes': pd.read_csv('data/athletes.csv'),
-        'medals': pd.read_csv('data/medals.csv'),
-        'medals_total': pd.read_csv('data/medals_total.csv'),
-        'events': pd.read_csv('data/events.csv'),
-        'nocs': pd.read_csv('data/nocs.csv'),
-        'schedules': pd.read_csv('data/schedules.csv'),  # Note: schedules.csv not schedule.csv
-        'venues': pd.read_csv('data/venues.csv'),
-        'coaches': pd.read_csv('data/coaches.csv'),
-        'medalists': pd.read_csv('data/medallists.csv')  # Note: medallists.csv
-    }
+    Load all required data files with caching for performance.
+    The @st.cache_resource decorator ensures data is loaded only once per
+    process, and every rerun gets the same frames back without the pickle
+    round-trip st.cache_data does. Those frames are shared, so they come back
+    read-only (see freeze_frame) in a read-only mapping: filtering or reading
+    them needs no defensive copy, and an accidental in-place write raises
+    instead of leaking into every other session.
+    Across restarts the prepared frames are also kept on disk (see
+    read_data_cache), so a new process doesn't parse the files again.
+    """
+    data = read_data_cache()
+    if data is None:
+        data = prepare_data()
+        write_data_cache(data)
+    for df in data.values():
+        freeze_frame(df)
+    return MappingProxyType(data)
+
+def freeze_frame(df):
+    """
+    Mark the arrays behind a dataframe's columns as read-only, in place.
+    
+    Why? numpy refuses writes into a non-writeable array, so code that tries
+    to modify a shared load_data() frame in place (df.loc[...] = ..., fillna(
+    inplace=True), ...) fails loudly. Adding or dropping columns is still
+    allowed by pandas; the pages work on filtered slices or assign() copies.
+    """
+    for block in df._mgr.blocks:
+        values = block.values
+        if isinstance(values, pd.Categorical):
+            # .codes is already a read-only view; freeze the array behind it
+            values = values._codes
+        elif hasattr(values, '_ndarray'):
+            # Datetime and other numpy-backed extension arrays
+            values = values._ndarray
+        if isinstance(values, np.ndarray):
+            values.flags.writeable = False
+    return df
+
+def read_data_cache():
+    """
+    Return the frames saved by write_data_cache(), or None if there's no usable copy.
+    
+    Why? Unpickling the prepared frames is much faster than reading and
+    preparing the files again. The copy is only used when it was written for
+    the current DATA_VERSION and is newer than every data file, so edited data
+    or preparation code never gets shadowed by it.
+    """
+    if not os.path.exists(DATA_CACHE_PATH):
+        return None
+    
+    cache_mtime = os.path.getmtime(DATA_CACHE_PATH)
+    for file_name in DATA_FILES.values():
+        for extension in ('csv', 'parquet'):
+            path = os.path.join(DATA_DIR, f'{file_name}.{extension}')
+            if os.path.exists(path) and os.path.getmtime(path) > cache_mtime:
+                return None
+    
+    try:
+        with open(DATA_CACHE_PATH, 'rb') as f:
+            version, data = pickle.load(f)
+    except Exception:
+        # Unreadable (e.g. written by another pandas version): it's rebuilt
+        return None
+    return data if version == DATA_VERSION else None
+
+def write_data_cache(data):
+    """Save the prepared frames for read_data_cache(). A failed write only loses the speed-up."""
+    tmp_path = DATA_CACHE_PATH + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((DATA_VERSION, data), f, protocol=5)
+        os.replace(tmp_path, DATA_CACHE_PATH)
+    except OSError:
+        pass
+
+def prepare_data():
+    """Read the data files and prepare them for the pages (the work load_data() caches)."""
+    # Read the files side by side: the CSV and Parquet readers release the GIL
+    # while parsing, so the load takes about as long as the largest file
+    with ThreadPoolExecutor(max_workers=min(len(DATA_FILES), os.cpu_count() or 1)) as executor:
+        tables = executor.map(
+            lambda name: read_table(DATA_FILES[name], DATA_COLUMNS.get(name)), DATA_FILES
+        )
+        data = dict(zip(DATA_FILES, tables))
     
     # Fix NOCs: rename 'code' to 'country_code' for consistency
     if 'code' in data['nocs'].columns and 'country_code' not in data['nocs'].columns:
@@ -33,50 +206,478 @@ def load_data():
             'Bronze Medal': 'Bronze'
         }, inplace=True)
     
+    # Parse dates once here instead of on every rerun (bad values become NaT).
+    # Schedule times keep their +02:00 offset, i.e. Paris local time.
+    for name, date_cols in DATE_COLUMNS.items():
+        for col in date_cols:
+            if col in data[name].columns:
+                data[name][col] = pd.to_datetime(data[name][col], format='ISO8601', errors='coerce')
+    
+    # Venue sports are stored as Python list literals ("['Judo', 'Wrestling']"):
+    # parse them once, without eval(), and keep a display string alongside
+    if 'sports' in data['venues'].columns:
+        venues = data['venues']
+        venues['sports'] = venues['sports'].map(
+            lambda x: ast.literal_eval(x) if isinstance(x, str) and x.startswith('[') else x
+        )
+        venues['sports_display'] = venues['sports'].map(
+            lambda x: ', '.join(x) if isinstance(x, list) else str(x)
+        )
+    
+    # Store filter/group columns as categoricals: isin() and groupby() then
+    # work on small integer codes instead of hashing every string. Name-like
+    # columns get contiguous Arrow string buffers, which makes unique() and ==
+    # cheaper and the frames lighter
+    for df in data.values():
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+    
+        for col in STRING_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('string[pyarrow]')
+    
     return data
 
+# pycountry_convert's alpha-3 -> alpha-2 table, built once: its
+# country_alpha3_to_country_alpha2() rebuilds the whole table on every call
+COUNTRY_ALPHA3_TO_ALPHA2 = pc.map_country_alpha3_to_country_alpha2()
+
+# Every code pycountry_convert knows (plus the special Olympic codes) resolved
+# once at import, so continent lookups are plain dict lookups instead of a
+# pycountry call per row. Codes missing from here resolve to 'Unknown'.
+COUNTRY_TO_CONTINENT = {
+    alpha3: CONTINENT_CODE_TO_CONTINENT_NAME.get(
+        COUNTRY_ALPHA2_TO_CONTINENT_CODE.get(alpha2), 'Unknown'
+    )
+    for alpha3, alpha2 in COUNTRY_ALPHA3_TO_ALPHA2.items()
+}
+# Special Olympic codes that aren't standard ISO codes take precedence
+COUNTRY_TO_CONTINENT.update(SPECIAL_CODES)
+
+# The same mapping as small integer ids into a fixed, sorted continent list,
+# so add_continent_column gathers int8 codes instead of re-sorting names
+CONTINENT_NAMES = sorted({*COUNTRY_TO_CONTINENT.values(), 'Unknown'})
+UNKNOWN_CONTINENT_ID = CONTINENT_NAMES.index('Unknown')
+COUNTRY_TO_CONTINENT_ID = {
+    code: CONTINENT_NAMES.index(continent) for code, continent in COUNTRY_TO_CONTINENT.items()
+}
+
 def get_continent_from_country_code(country_code):
     """
     Convert a 3-letter country code (NOC) to its continent.
     
     Why? We need continent-level analysis but the dataset only has country codes.
-    This uses the pycountry library to map countries to continents.
+    The pycountry tables are folded into COUNTRY_TO_CONTINENT at import, so
+    this is a single dict lookup; NaN, '' and unknown codes give 'Unknown'.
+    """
+    return COUNTRY_TO_CONTINENT.get(country_code, 'Unknown')
+
+def flag_emoji(country_alpha2):
     """
-    if pd.isna(country_code) or country_code == '':
-        return 'Unknown'
+    Spell a 2-letter ISO country code as its flag emoji.
     
-    try:
-        # Handle special Olympic codes that aren't standard ISO codes
-        special_codes = {
-            'ROC': 'Europe',  # Russian Olympic Committee
-            'AIN': 'Europe',  # Individual Neutral Athletes
-            'EOR': 'Unknown', # Refugee Olympic Team
-            'IOP': 'Unknown'  # Independent Olympic Participants
-        }
-        
-        if country_code in special_codes:
-            return special_codes[country_code]
-        
-        country_alpha2 = pc.country_alpha3_to_country_alpha2(country_code)
-        continent_code = pc.country_alpha2_to_continent_code(country_alpha2)
-        continent_name = pc.convert_continent_code_to_continent_name(continent_code)
-        return continent_name
-    except:
-        return 'Unknown'
+    Why? Flag emojis are just the two letters as regional indicator symbols,
+    so the profile card can show a flag without any image assets.
+    """
+    return ''.join(chr(0x1F1E6 + ord(letter) - ord('A')) for letter in country_alpha2.upper())
+
+# NOC codes whose nocs.csv names don't match a pycountry name, for teams that
+# do fly their country's flag. Others (TPE, KOS, AIN, EOR, ...) get no flag.
+NOC_TO_ALPHA2 = {
+    'COD': 'CD', 'GBR': 'GB', 'HKG': 'HK', 'ISV': 'VI',
+    'KOR': 'KR', 'PLE': 'PS', 'VIN': 'VC'
+}
+
+@st.cache_data(show_spinner=False, ttl=None)
+def load_noc_flags(data_version=DATA_VERSION):
+    """
+    Flag emoji per NOC code, resolved once from the NOC names in nocs.csv.
+    
+    Why? NOC codes aren't ISO codes: some differ (GER, NED) and a few are
+    another country's ISO code (BRN is Bahrain's NOC but Brunei's ISO code).
+    So each NOC goes through its country name to pycountry instead, plus the
+    NOC_TO_ALPHA2 exceptions. A NOC that can't be matched has no entry, so
+    the caller shows no flag rather than a wrong one. data_version is only
+    there to be part of the cache key.
+    """
+    nocs = load_data()['nocs']
+    if 'code' not in nocs.columns:
+        return {}
+    
+    # Exact (case-insensitive) country names only: a fuzzy match could pick
+    # the wrong country
+    name_to_alpha2 = {}
+    for country in pycountry.countries:
+        for attr in ('name', 'official_name', 'common_name'):
+            name = getattr(country, attr, None)
+            if name:
+                name_to_alpha2.setdefault(name.casefold(), country.alpha_2)
+    
+    name_cols = [col for col in ('country', 'country_long') if col in nocs.columns]
+    flags = {}
+    for row in nocs[['code', *name_cols]].itertuples(index=False):
+        code, names = row[0], [name for name in row[1:] if isinstance(name, str)]
+        alpha2 = NOC_TO_ALPHA2.get(code) or next(
+            (name_to_alpha2[name.casefold()] for name in names if name.casefold() in name_to_alpha2), None
+        )
+        if alpha2 is not None:
+            flags[code] = flag_emoji(alpha2)
+    return flags
 
 def add_continent_column(df, country_col='country_code'):
     """
     Add a 'continent' column to any dataframe that has country codes.
     
     This is essential because many visualizations require continent grouping.
+    Each distinct country code is looked up once: a categorical column (see
+    load_data) already has its codes, any other column is factorized first.
+    The integer codes then index a small code -> continent id table (see
+    COUNTRY_TO_CONTINENT_ID), so the rows themselves are never hashed again.
     """
     if country_col in df.columns:
-        df['continent'] = df[country_col].apply(get_continent_from_country_code)
+        countries = df[country_col]
+        if isinstance(countries.dtype, pd.CategoricalDtype):
+            codes, distinct = countries.cat.codes.to_numpy(), countries.cat.categories
+        else:
+            codes, distinct = pd.factorize(countries)
+        lookup = np.array(
+            [COUNTRY_TO_CONTINENT_ID.get(code, UNKNOWN_CONTINENT_ID) for code in distinct] + [UNKNOWN_CONTINENT_ID],
+            dtype=np.int8
+        )
+        # Missing country codes are -1, which picks the trailing 'Unknown' entry
+        df['continent'] = pd.Categorical.from_codes(
+            lookup[codes], categories=CONTINENT_NAMES
+        ).remove_unused_categories()
     else:
-        # If column doesn't exist, add Unknown
-        df['continent'] = 'Unknown'
+        # If column doesn't exist, add Unknown (all-zero codes, no per-row list)
+        df['continent'] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), categories=['Unknown'])
     return df
 
+@st.cache_data(show_spinner=False, ttl=None)
+def uncategorize(df):
+    """
+    Cast categorical columns back to plain values.
+    
+    Why? Plotly Express regroups its input with pandas defaults, which expands
+    categoricals into every category (or combination of categories). Frames
+    passed to path/color charts should go through this first.
+    """
+    cat_cols = df.select_dtypes('category').columns
+    return df.astype({col: df[col].cat.categories.dtype for col in cat_cols})
+
+def top_n(df, col, n):
+    """
+    Return the n rows with the largest col values, largest first, like
+    df.nlargest(n, col).
+    
+    Why? np.partition finds the n-th largest value in linear time, so only
+    the handful of rows at or above it need sorting. The sort is stable, so
+    ties always keep their original row order, whatever the frame's length
+    or dtype (nlargest's own tie order depends on both). Missing values
+    rank last, as in nlargest, so n rows come back whenever df has n rows.
+    """
+    values = df[col].to_numpy(dtype='float64', na_value=np.nan)
+    present = np.flatnonzero(~np.isnan(values))
+    
+    candidates = present
+    if len(present) > n:
+        cutoff = np.partition(values[present], len(present) - n)[len(present) - n]
+        candidates = present[values[present] >= cutoff]
+    order = candidates[np.argsort(-values[candidates], kind='stable')][:n]
+    
+    # Fill up with missing values (in row order) when there are too few others
+    if len(order) < n:
+        order = np.concatenate([order, np.flatnonzero(np.isnan(values))[:n - len(order)]])
+    return df.iloc[order]
+
+def sample_evenly(df, n, order_col):
+    """
+    Pick n rows spread evenly over df sorted by order_col.
+    
+    Why? Plotly draws every bar it's given, so long schedules are cut down
+    before charting. Evenly spaced rows (always including the first and the
+    last) keep the whole time range in view, where head(n) only shows its
+    beginning.
+    """
+    if len(df) <= n:
+        return df
+    ordered = df.sort_values(order_col, kind='stable')
+    return ordered.iloc[np.linspace(0, len(ordered) - 1, n).round().astype(int)]
+
+def box_stats(df, group_col, value_col):
+    """
+    Summarise value_col per group into what a box plot draws: quartiles,
+    whisker ends, and the (distinct) points outside the whiskers.
+    
+    Why? Plotly then gets a few numbers per group instead of every row.
+    Quartiles use Plotly's default 'linear' method (Hazen interpolation) and
+    the whiskers end at the furthest values within 1.5 IQR, so the boxes look
+    like px.box's. Groups come out in order of first appearance.
+    Returns (stats, outliers) DataFrames.
+    """
+    stats, outliers = [], []
+    for group, values in df.groupby(group_col, sort=False, observed=True)[value_col]:
+        values = np.sort(values.dropna().to_numpy())
+        if len(values) == 0:
+            continue
+        q1, median, q3 = np.percentile(values, [25, 50, 75], method='hazen')
+        reach = 1.5 * (q3 - q1)
+        inside = values[(values >= q1 - reach) & (values <= q3 + reach)]
+        stats.append((group, q1, median, q3, inside.min(), inside.max()))
+        outliers.extend((group, v) for v in np.unique(values[(values < inside.min()) | (values > inside.max())]))
+    return (
+        pd.DataFrame(stats, columns=[group_col, 'q1', 'median', 'q3', 'lowerfence', 'upperfence']),
+        pd.DataFrame(outliers, columns=[group_col, value_col])
+    )
+
+def limit_hierarchy(df, path, value_col, max_leaves=500, other_label='Other'):
+    """
+    Keep the largest leaves of a sunburst/treemap table and roll up the rest.
+    
+    Why? Plotly draws one sector per row, and hundreds of one-medal slivers
+    slow the browser down without being readable. Rows smaller than the
+    max_leaves-th largest are summed into an 'Other' node under their
+    top-level parent, so the top-level totals don't change. Ties at the
+    cut-off are all kept rather than split arbitrarily. Expects plain
+    (non-categorical) columns.
+    """
+    if len(df) <= max_leaves:
+        return df
+    
+    values = df[value_col]
+    keep = values >= values.nlargest(max_leaves).iloc[-1]
+    if keep.all():
+        return df
+    
+    other = df.loc[~keep].groupby(path[0], sort=False, observed=True)[value_col].sum().reset_index()
+    for col in path[1:]:
+        other[col] = other_label
+    return pd.concat([df.loc[keep], other[df.columns]], ignore_index=True)
+
+@st.cache_data(show_spinner=False, ttl=None)
+def load_frame_with_continent(name, country_col='country_code'):
+    """
+    Return one of the loaded dataframes with its 'continent' column already added.
+    
+    Why? The continent lookup runs over the full frame, so doing it once here
+    means reruns only pay for filtering, not for the mapping.
+    """
+    return add_continent_column(load_data()[name].copy(), country_col)
+
+def distinct_values(series):
+    """
+    Sorted distinct non-missing values of a column, for option lists.
+    
+    Why? A categorical column (see load_data) already knows its distinct values:
+    its categories never include NaN, so the rows aren't scanned at all and only
+    the short category list is sorted. Other columns fall back to pd.unique.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return sorted(series.cat.categories)
+    return sorted(pd.unique(series.dropna()))
+
+@st.cache_data(show_spinner=False, ttl=None)
+def load_filter_options(data_version=DATA_VERSION):
+    """
+    The sidebar's option lists, built once from the loaded data.
+    
+    Why? The sidebar is drawn on every rerun, but its options only change with
+    the data, so reruns read them from the cache instead of scanning and
+    sorting the columns again. An entry is None when its column is missing;
+    medals holds (display name, value) pairs. data_version is only there to
+    be part of the cache key.
+    """
+    data = load_data()
+    options = dict.fromkeys(['continents', 'countries', 'sports', 'genders', 'medals'])
+    
+    # Continents of the NOCs ('Unknown' left out), looked up per distinct code
+    # so the NOCs frame isn't copied just to get a handful of names
+    if 'country_code' in data['nocs'].columns:
+        noc_codes = data['nocs']['country_code'].dropna().unique()
+        continents = {get_continent_from_country_code(code) for code in noc_codes}
+        options['continents'] = sorted(continents - {'Unknown'})
+    
+    # Country filter - find the right dataframe with country info
+    country_df = data['nocs'] if 'country_code' in data['nocs'].columns else data['athletes']
+    if 'country_code' in country_df.columns:
+        options['countries'] = distinct_values(country_df['country_code'])
+    
+    if 'sport' in data['events'].columns:
+        options['sports'] = distinct_values(data['events']['sport'])
+    
+    if 'gender' in data['athletes'].columns:
+        options['genders'] = distinct_values(data['athletes']['gender'])
+    
+    # Medal type filter - check what the column is actually called
+    medal_df = data['medals']
+    medal_col = 'medal_type' if 'medal_type' in medal_df.columns else 'medal'
+    
+    if medal_col in medal_df.columns:
+        # Try to identify gold, silver, bronze (case-insensitive) among the actual values
+        options['medals'] = []
+        for medal in distinct_values(medal_df[medal_col]):
+            medal_lower = str(medal).lower()
+            if 'gold' in medal_lower:
+                options['medals'].append(('Gold', medal))
+            elif 'silver' in medal_lower:
+                options['medals'].append(('Silver', medal))
+            elif 'bronze' in medal_lower:
+                options['medals'].append(('Bronze', medal))
+        # Podium order (Gold, Silver, Bronze) rather than alphabetical
+        options['medals'].sort(key=lambda pair: list(MEDAL_COLORS).index(pair[0]))
+    
+    return options
+
+@st.cache_data(show_spinner=False, ttl=None)
+def load_athlete_disciplines():
+    """
+    One entry per athlete and discipline, parsed once from athletes['disciplines'].
+    
+    Why? The column holds each athlete's list of disciplines written out as
+    text ("['Swimming', 'Diving']"). Exploding it once lets the sport filter use
+    an isin() on a categorical instead of a regex over every string. Entries
+    keep the row labels of the athletes frame, so matches select athletes
+    directly.
+    """
+    disciplines = load_data()['athletes']['disciplines']
+    # Some lists aren't quoted ("[Athletics]"), so split the text instead of literal_eval
+    exploded = disciplines.str.strip('[]').str.split(',').explode().str.strip(" '\"")
+    return exploded[exploded.fillna('') != ''].astype('category')
+
+def freeze_filters(filters):
+    """
+    Turn the sidebar selections into sorted tuples.
+    
+    Lists can't be hashed by st.cache_data, and sorting means the same
+    selection made in a different order still hits the same cache entry.
+    """
+    return {key: tuple(sorted(values)) for key, values in filters.items()}
+
+def build_filter_mask(df, conditions):
+    """
+    Combine several isin() filters into one boolean mask.
+    
+    conditions maps a column name to the selected values. Empty selections and
+    columns the dataframe doesn't have are skipped, so slicing once with the
+    result replaces a chain of filters that each produced an intermediate copy.
+    Categorical columns are tested once per category; the rows then only
+    index that small lookup table with their integer codes. Those lookups
+    all write into one scratch buffer that is ANDed in place, so extra
+    conditions don't allocate new row-length arrays.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    scratch = None
+    for col, values in conditions.items():
+        if values and col in df.columns:
+            column = df[col]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                # Trailing False: missing values have code -1
+                allowed = np.append(column.cat.categories.isin(values), False)
+                if scratch is None:
+                    scratch = np.empty(len(df), dtype=bool)
+                np.take(allowed, column.cat.codes.to_numpy(), out=scratch)
+                mask &= scratch
+            else:
+                mask &= column.isin(values).to_numpy()
+    return mask
+
+def filter_frames(jobs, min_rows=PARALLEL_FILTER_MIN_ROWS):
+    """
+    Slice several frames with build_filter_mask, on a thread pool for large data.
+    
+    jobs maps a name to a (df, conditions) pair; the filtered frames come back
+    under the same names. Why? The frames are independent and the isin()
+    kernels release the GIL, so once the data is large the filters can run at
+    the same time. For the current dataset (a few thousand rows) starting the
+    threads costs more than the filtering, so small inputs run serially.
+    A frame with no active condition comes back as it is, without a mask or
+    a copy (the callers are cached, so it's pickled before anyone sees it).
+    """
+    def run(job):
+        df, conditions = job
+        if not any(values for col, values in conditions.items() if col in df.columns):
+            return df
+        return df.loc[build_filter_mask(df, conditions)]
+    
+    if sum(len(df) for df, _ in jobs.values()) < min_rows:
+        return {name: run(job) for name, job in jobs.items()}
+    
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        return dict(zip(jobs, executor.map(run, jobs.values())))
+
+@st.cache_data(show_spinner=False, ttl=None)
+def get_filtered_data(frozen_filters, data_version=DATA_VERSION):
+    """
+    Apply the sidebar filters and return the filtered frames shared by the pages.
+    
+    Why? Streamlit reruns the whole script on every widget change. One cached
+    function keyed on the frozen selection (see freeze_filters) means the
+    pandas filtering only runs when the selection changes, and moving to
+    another page with the same selection is a cache hit. data_version is
+    only there to be part of the cache key.
+    """
+    data = load_data()
+    countries = frozen_filters['countries']
+    sports = frozen_filters['sports']
+    genders = frozen_filters['genders']
+    continents = frozen_filters['continents']
+    medals = frozen_filters['medals']
+    
+    # Continent information is added once, on the full frames
+    medals_df = load_frame_with_continent('medals', 'country_code')
+    medals_total_df = load_frame_with_continent('medals_total', 'country_code')
+    athletes_df = data['athletes']
+    events_df = data['events']
+    
+    # Identify the medal and sport column names (could be 'medal_type'/'medal', 'discipline'/'sport')
+    medal_col = 'medal_type' if 'medal_type' in medals_df.columns else 'medal'
+    sport_col = 'discipline' if 'discipline' in medals_df.columns else 'sport'
+    
+    # Create gender_display so it matches the gender filter values (keep original too).
+    # gender is categorical (see load_data), so only the category labels are renamed.
+    # medals also has X (mixed) and O (open) events: rename_categories leaves
+    # categories missing from GENDER_MAP alone, so those pass through unchanged
+    if 'gender' in medals_df.columns:
+        medals_df['gender_display'] = medals_df['gender'].cat.rename_categories(GENDER_MAP)
+    
+    # Each frame is sliced once with a combined mask
+    frames = filter_frames({
+        'medals': (medals_df, {
+            'country_code': countries,
+            sport_col: sports,
+            'continent': continents,
+            'gender_display': genders,
+            medal_col: medals
+        }),
+        'medals_total': (medals_total_df, {
+            'country_code': countries,
+            'continent': continents
+        }),
+        'athletes': (athletes_df, {
+            'country_code': countries,
+            'gender': genders
+        }),
+        'events': (events_df, {'sport': sports})
+    })
+    medals_df = frames['medals']
+    medals_total_df = frames['medals_total']
+    athletes_df = frames['athletes']
+    events_df = frames['events']
+    
+    # KPI counts are computed here too, so reruns read them from the cache
+    return {
+        'medals': medals_df,
+        'medals_total': medals_total_df,
+        'athletes': athletes_df,
+        'events': events_df,
+        'n_medals': len(medals_df),
+        'n_athletes': athletes_df['name'].nunique(),
+        'n_countries': athletes_df['country_code'].nunique() if 'country_code' in athletes_df.columns else 0,
+        'n_sports': events_df['sport'].nunique(),
+        'n_events': events_df['event'].nunique()
+    }
+
 def apply_filters(df, selected_countries, selected_sports, selected_medals):
     """
     Apply sidebar filters to a dataframe.
@@ -84,56 +685,49 @@ def apply_filters(df, selected_countries, selected_sports, selected_medals):
     Why? Every page needs consistent filtering behavior.
     This function handles the logic once instead of repeating it everywhere.
     """
-    filtered_df = df.copy()
-    
-    if selected_countries and 'country_code' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['country_code'].isin(selected_countries)]
-    
-    if selected_sports and 'sport' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['sport'].isin(selected_sports)]
+    # Nothing selected (the initial render): no mask, no slice
+    if not (selected_countries or selected_sports or selected_medals):
+        return df
     
     # Handle different medal column names
-    medal_col = None
-    if 'medal_type' in filtered_df.columns:
-        medal_col = 'medal_type'
-    elif 'medal' in filtered_df.columns:
-        medal_col = 'medal'
+    medal_col = 'medal_type' if 'medal_type' in df.columns else 'medal'
     
-    if selected_medals and medal_col:
-        filtered_df = filtered_df[filtered_df[medal_col].isin(selected_medals)]
-    
-    return filtered_df
+    # One combined mask and a single slice (missing columns are skipped). The
+    # slice is a new frame, so df itself is never modified and isn't copied
+    mask = build_filter_mask(df, {
+        'country_code': selected_countries,
+        'sport': selected_sports,
+        medal_col: selected_medals
+    })
+    return df.loc[mask]
 
 def create_sidebar_filters(data):
     """
     Create consistent sidebar filters across all pages.
+    The option lists come from the cached load_filter_options(); data is
+    still taken so the pages can call this with what they loaded.
     
     Returns: Dictionary with all selected filter values
     """
     st.sidebar.header("🔍 Global Filters")
+    options = load_filter_options()
     
-    # Get unique continents
-    if 'country_code' in data['nocs'].columns:
-        nocs_with_continent = add_continent_column(data['nocs'].copy(), 'country_code')
-        all_continents = sorted([c for c in nocs_with_continent['continent'].unique() if c != 'Unknown'])
-        
+    # Continent filter
+    if options['continents'] is not None:
         selected_continents = st.sidebar.multiselect(
             "Select Continents",
-            options=all_continents,
+            options=options['continents'],
             default=[],
             help="Filter by geographical continents"
         )
     else:
         selected_continents = []
         
-    # Country filter - find the right dataframe with country info
-    country_df = data['nocs'] if 'country_code' in data['nocs'].columns else data['athletes']
-    
-    if 'country_code' in country_df.columns:
-        all_countries = sorted(country_df['country_code'].dropna().unique())
+    # Country filter
+    if options['countries'] is not None:
         selected_countries = st.sidebar.multiselect(
             "Select Countries",
-            options=all_countries,
+            options=options['countries'],
             default=[],
             help="Filter by specific countries (NOC codes)"
         )
@@ -142,11 +736,10 @@ def create_sidebar_filters(data):
         selected_countries = []
     
     # Sport filter
-    if 'sport' in data['events'].columns:
-        all_sports = sorted(data['events']['sport'].dropna().unique())
+    if options['sports'] is not None:
         selected_sports = st.sidebar.multiselect(
             "Select Sports",
-            options=all_sports,
+            options=options['sports'],
             default=[],
             help="Filter by Olympic sports"
         )
@@ -154,42 +747,26 @@ def create_sidebar_filters(data):
         selected_sports = []
         
     # ---- Gender filter ----
-    if 'gender' in data['athletes'].columns:
-        all_genders = sorted(data['athletes']['gender'].dropna().unique())
+    if options['genders'] is not None:
         selected_genders = st.sidebar.multiselect(
             "Select Gender",
-            options=all_genders,
+            options=options['genders'],
             default=[],
             help="Filter by athlete gender"
         )
     else:
         selected_genders = []
     
-    # Medal type filter - check what the column is actually called
-    medal_df = data['medals']
-    medal_col = 'medal_type' if 'medal_type' in medal_df.columns else 'medal'
-    
-    if medal_col in medal_df.columns:
-        # Get actual medal values from data
-        unique_medals = medal_df[medal_col].dropna().unique()
-        
-        # Try to identify gold, silver, bronze (case-insensitive)
-        medal_types = []
-        for medal in unique_medals:
-            medal_lower = str(medal).lower()
-            if 'gold' in medal_lower:
-                medal_types.append(('Gold', medal))
-            elif 'silver' in medal_lower:
-                medal_types.append(('Silver', medal))
-            elif 'bronze' in medal_lower:
-                medal_types.append(('Bronze', medal))
-        
-        selected_medals = []
-        st.sidebar.write("**Medal Types:**")
-        
-        for display_name, actual_value in medal_types:
-            if st.sidebar.checkbox(f"{display_name} Medal", value=True):
-                selected_medals.append(actual_value)
+    # Medal type filter: one widget for all medal types (all selected by default)
+    if options['medals'] is not None:
+        medal_labels = {actual_value: f"{display_name} Medal" for display_name, actual_value in options['medals']}
+        selected_medals = st.sidebar.multiselect(
+            "Medal Types",
+            options=list(medal_labels),
+            default=list(medal_labels),
+            format_func=medal_labels.get,
+            help="Filter by medal type"
+        )
     else:
         selected_medals = []
     